@@ -1,4 +1,5 @@
 # llmfiles/cli/interface.py
+import re
 import shutil
 import sys
 import tempfile
@@ -12,7 +13,7 @@ from llmfiles.config.settings import PromptConfig, ChunkStrategy, ExternalDepsSt
 from llmfiles.logging_setup import configure_logging
 from llmfiles.core.pipeline import PromptGenerator
 from llmfiles.core.output import write_to_file, write_to_stdout
-from llmfiles.core.github import is_github_url, clone_github_repo
+from llmfiles.core.github import is_github_url, clone_github_repos
 from llmfiles.exceptions import SmartPromptBuilderError, GitError
 from llmfiles.structured_processing import ast_utils
 
@@ -26,13 +27,22 @@ def _format_file_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.1f}TB"
 
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([KMGT]?B?)$')
+
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+    'TB': 1024 ** 4
+}
+
 def _parse_file_size(size_str: str) -> int:
     """Parse human-readable file size to bytes (e.g., '1MB' -> 1048576)."""
     size_str = size_str.strip().upper()
 
     # Extract number and unit
-    import re
-    match = re.match(r'^(\d+(?:\.\d+)?)\s*([KMGT]?B?)$', size_str)
+    match = _SIZE_RE.match(size_str)
     if not match:
         raise ValueError(f"Invalid size format: {size_str}. Use formats like '1MB', '500KB', '10GB'")
 
@@ -43,18 +53,11 @@ def _parse_file_size(size_str: str) -> int:
     if unit in ['K', 'M', 'G', 'T']:
         unit = unit + 'B'
 
-    multipliers = {
-        'B': 1,
-        'KB': 1024,
-        'MB': 1024 ** 2,
-        'GB': 1024 ** 3,
-        'TB': 1024 ** 4
-    }
-
-    if unit not in multipliers:
+    multiplier = _SIZE_MULTIPLIERS.get(unit)
+    if multiplier is None:
         raise ValueError(f"Unknown size unit: {unit}")
 
-    return int(number * multipliers[unit])
+    return int(number * multiplier)
 
 def _print_summary_to_console(included_files: List[dict]):
     # this helper function now lives in the cli module.
@@ -134,6 +137,12 @@ def _print_summary_to_console(included_files: List[dict]):
     default=None,
     help="exclude files larger than specified size (e.g., '1MB', '500KB', '10MB'). accepts units: B, KB, MB, GB."
 )
+@click.option(
+    "--read-threads",
+    type=click.IntRange(min=1),
+    default=None,
+    help="number of threads used to read and process files. defaults to min(32, 4 x cpu count); 1 processes files serially."
+)
 @click.option(
     "--git-since",
     type=str,
@@ -228,23 +237,24 @@ def main_cli_group(paths, verbose, **kwargs):
 
         # Process paths: detect GitHub URLs and clone them, convert strings to Path
         processed_paths = []
-        github_base_dir = None
+        github_indices = []
         for path_str in paths:
             if is_github_url(path_str):
                 log.info("detected_github_url", url=path_str)
-                temp_dir = Path(tempfile.mkdtemp(prefix="llmfiles_github_"))
-                temp_dirs.append(temp_dir)
-                cloned_path = clone_github_repo(path_str, temp_dir)
-                processed_paths.append(cloned_path)
-                # Use first cloned repo as base_dir for relative path calculations
-                if github_base_dir is None:
-                    github_base_dir = cloned_path
-                log.info("github_repo_cloned", url=path_str, local_path=str(cloned_path))
+                temp_dirs.append(Path(tempfile.mkdtemp(prefix="llmfiles_github_")))
+                github_indices.append(len(processed_paths))
+                processed_paths.append(None)
             else:
                 processed_paths.append(Path(path_str))
 
-        kwargs["include_patterns"] = list(kwargs["include_patterns"])
-        kwargs["exclude_patterns"] = list(kwargs["exclude_patterns"])
+        # Clone all GitHub URLs at once; results come back in input order.
+        github_urls = [paths[i] for i in github_indices]
+        cloned_paths = clone_github_repos(github_urls, temp_dirs)
+        for i, url, cloned_path in zip(github_indices, github_urls, cloned_paths):
+            processed_paths[i] = cloned_path
+            log.info("github_repo_cloned", url=url, local_path=str(cloned_path))
+        # Use first cloned repo as base_dir for relative path calculations
+        github_base_dir = cloned_paths[0] if cloned_paths else None
 
         # Set base_dir for GitHub repos (only if all paths are GitHub URLs)
         # Resolve to handle symlinks (e.g., /var -> /private/var on macOS)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
 import structlog
 
 log = structlog.get_logger(__name__)
@@ -56,8 +56,8 @@ class OutputFormat(Enum):
 class PromptConfig:
     # holds all configuration parameters for a single run.
     input_paths: List[Path] = field(default_factory=list)
-    include_patterns: List[str] = field(default_factory=list)
-    exclude_patterns: List[str] = field(default_factory=list)
+    include_patterns: Sequence[str] = ()  # click passes a tuple; kept as-is since nothing mutates it
+    exclude_patterns: Sequence[str] = ()
     grep_content_pattern: Optional[str] = None
     chunk_strategy: ChunkStrategy = ChunkStrategy.FILE
     external_deps_strategy: ExternalDepsStrategy = ExternalDepsStrategy.IGNORE
@@ -68,6 +68,7 @@ class PromptConfig:
     no_codeblock: bool = False
     exclude_binary: bool = True
     max_file_size: Optional[int] = None  # Maximum file size in bytes, None = no limit
+    read_threads: Optional[int] = None  # File processing threads, None = min(32, 4 x cpu count)
     git_since: Optional[str] = None  # Git date filter (e.g., "7 days ago", "2025-01-01")
     output_file: Optional[Path] = None
     read_from_stdin: bool = False
@@ -19,20 +19,6 @@ def get_git_modified_files(since: str, base_dir: Path) -> Optional[Set[Path]]:
         Set of Path objects for modified files, or None if git command fails
     """
     try:
-        # Check if we're in a git repository
-        check_cmd = ["git", "rev-parse", "--git-dir"]
-        result = subprocess.run(
-            check_cmd,
-            cwd=base_dir,
-            capture_output=True,
-            text=True,
-            check=False
-        )
-
-        if result.returncode != 0:
-            log.warning("not_a_git_repository", base_dir=str(base_dir))
-            return None
-
         # Get files modified since the specified date
         # Using git log to get all files that have been touched
         git_cmd = [
@@ -52,6 +38,10 @@ def get_git_modified_files(since: str, base_dir: Path) -> Optional[Set[Path]]:
         )
 
         if result.returncode != 0:
+            # Only pay for the repository check when git log has already failed.
+            if not is_git_repository(base_dir):
+                log.warning("not_a_git_repository", base_dir=str(base_dir))
+                return None
             log.error(
                 "git_command_failed",
                 command=" ".join(git_cmd),
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
 _GLOB_CHARS = frozenset("*?[")
 
@@ -29,7 +29,7 @@ def _expand_one(piece: str, base_dir: Path) -> str:
     return f"**/*.{piece}"
 
 
-def expand_user_patterns(patterns: List[str], base_dir: Path) -> List[str]:
+def expand_user_patterns(patterns: Sequence[str], base_dir: Path) -> List[str]:
     """Expand user-friendly pattern shorthand into gitignore-style globs.
 
     Rules, applied per comma-split piece:
@@ -1,6 +1,6 @@
 # llmfiles/core/discovery/pattern_matching.py
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import pathspec
 import structlog
 
@@ -36,12 +36,20 @@ def is_path_hidden(path_relative_to_root: Path, config: PromptConfig) -> bool:
         return False
     return any(part.startswith(".") and part not in (".", "..") for part in path_relative_to_root.parts)
 
+def is_name_hidden(name: str, config: PromptConfig) -> bool:
+    # single-component form of is_path_hidden, for names listed inside a directory.
+    if config.hidden:
+        return False
+    return name.startswith(".") and name not in (".", "..")
+
 def is_path_gitignored(
     absolute_path_item: Path,
     config: PromptConfig,
     gitignore_specs_cache: Dict[Path, Optional[pathspec.PathSpec]],
+    is_dir: bool = False,
 ) -> bool:
     # checks if an item is ignored by any relevant .gitignore files by traversing upwards.
+    # directories are matched with a trailing slash so dir-only patterns (`build/`) apply.
     if config.no_ignore:
         return False
 
@@ -54,9 +62,15 @@ def is_path_gitignored(
 
         spec = gitignore_specs_cache[current_dir_to_check]
         if spec:
+            # a negated pattern may re-include something below this directory;
+            # leave those directories to the per-file checks.
+            if is_dir and any(pattern.include is False for pattern in spec.patterns):
+                return False
             try:
                 path_relative_to_gitignore_dir = absolute_path_item.relative_to(current_dir_to_check)
                 path_str_for_match = path_relative_to_gitignore_dir.as_posix()
+                if is_dir:
+                    path_str_for_match += "/"
 
                 if spec.match_file(path_str_for_match):
                     return True
@@ -69,6 +83,34 @@ def is_path_gitignored(
 
     return False
 
+def literal_include_dir_prefixes(include_patterns: List[str]) -> Optional[Tuple[str, ...]]:
+    # returns the literal leading directories of the include patterns (`src/**` -> `src`,
+    # `docs/api/*.md` -> `docs/api`), or None when some pattern can match at any depth.
+    # only patterns anchored to the root (a `/` before the last segment) have such a prefix.
+    prefixes = []
+    for pattern in include_patterns:
+        if pattern.startswith("!"):
+            return None
+        segments = pattern.strip("/").split("/")
+        if len(segments) < 2:
+            return None
+        literal_dirs = []
+        for segment in segments[:-1]:
+            if any(ch in "*?[\\" for ch in segment):
+                break
+            literal_dirs.append(segment)
+        if not literal_dirs:
+            return None
+        prefixes.append("/".join(literal_dirs))
+    return tuple(prefixes) if prefixes else None
+
+def dir_may_contain_includes(rel_dir: str, include_dir_prefixes: Tuple[str, ...]) -> bool:
+    # true if a directory lies on the way to, or inside, one of the literal include prefixes.
+    for prefix in include_dir_prefixes:
+        if rel_dir == prefix or prefix.startswith(rel_dir + "/") or rel_dir.startswith(prefix + "/"):
+            return True
+    return False
+
 def check_glob_match_rules(
     path_for_glob_matching: Path,
     include_spec: pathspec.PathSpec, # now non-optional
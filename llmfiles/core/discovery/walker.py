@@ -1,7 +1,8 @@
 # llmfiles/core/discovery/walker.py
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterator, Dict, Optional, Set
+from typing import Iterator, Dict, Optional, Set, Tuple
 import structlog
 
 from llmfiles.config.settings import PromptConfig
@@ -9,11 +10,15 @@ from llmfiles.core.discovery.path_resolution import resolve_initial_seed_paths
 from llmfiles.core.discovery.pattern_matching import (
     compile_glob_patterns_to_spec,
     is_path_hidden,
+    is_name_hidden,
     is_path_gitignored,
+    literal_include_dir_prefixes,
+    dir_may_contain_includes,
     pathspec
 )
 from llmfiles.core.discovery.pattern_expansion import expand_user_patterns
 from llmfiles.core.discovery.git_utils import get_git_modified_files
+from llmfiles.util import relative_path_str
 
 log = structlog.get_logger(__name__)
 
@@ -38,16 +43,38 @@ def discover_paths(config: PromptConfig) -> Iterator[Path]:
     if not seed_paths:
         return
 
-    # Get git-filtered files if --git-since is specified
-    git_modified_files: Optional[Set[Path]] = None
-    if config.git_since:
-        git_modified_files = get_git_modified_files(config.git_since, config.base_dir)
-        if git_modified_files is None:
-            log.warning("git_filtering_failed", continuing_without_git_filter=True)
-        elif not git_modified_files:
-            log.info("no_files_modified_in_git_range", since=config.git_since)
-            return
+    # when every include pattern starts with literal directories, only those
+    # directories (and their parents) need to be listed.
+    include_dir_prefixes = literal_include_dir_prefixes(include_patterns)
 
+    candidates = _walk_seed_paths(seed_paths, include_spec, exclude_spec, include_dir_prefixes, config)
+    if not config.git_since:
+        yield from candidates
+        return
+
+    # `git log` runs in a worker thread while the tree is walked; candidates are
+    # filtered once both are done.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        git_future = executor.submit(get_git_modified_files, config.git_since, config.base_dir)
+        candidate_list = list(candidates)
+        git_modified_files = git_future.result()
+
+    if git_modified_files is None:
+        log.warning("git_filtering_failed", continuing_without_git_filter=True)
+        yield from candidate_list
+    elif not git_modified_files:
+        log.info("no_files_modified_in_git_range", since=config.git_since)
+    else:
+        yield from (path for path in candidate_list if path in git_modified_files)
+
+def _walk_seed_paths(
+    seed_paths: Set[Path],
+    include_spec: pathspec.PathSpec,
+    exclude_spec: Optional[pathspec.PathSpec],
+    include_dir_prefixes: Optional[Tuple[str, ...]],
+    config: PromptConfig,
+) -> Iterator[Path]:
+    """Yields each file under the seed paths that passes the pattern, hidden and gitignore filters."""
     gitignore_cache: Dict[Path, Optional[pathspec.PathSpec]] = {}
     yielded_files: Set[Path] = set()
 
@@ -58,9 +85,6 @@ def discover_paths(config: PromptConfig) -> Iterator[Path]:
             path_str = rel_path.as_posix()
             if include_spec.match_file(path_str) and not (exclude_spec and exclude_spec.match_file(path_str)):
                 if not is_path_hidden(rel_path, config) and not is_path_gitignored(seed_path, config, gitignore_cache):
-                    # Apply git filter if specified
-                    if git_modified_files is not None and seed_path not in git_modified_files:
-                        continue
                     if seed_path not in yielded_files:
                         yield seed_path
                         yielded_files.add(seed_path)
@@ -68,31 +92,43 @@ def discover_paths(config: PromptConfig) -> Iterator[Path]:
 
         # walk directories.
         for root, dirs, files in os.walk(str(seed_path), topdown=True, followlinks=config.follow_symlinks):
-            # prune directories.
+            # relative paths are built from one string per directory instead of a
+            # Path.relative_to() per entry.
+            rel_root = relative_path_str(root, config.base_dir)
+            if rel_root is None:
+                rel_root = str(Path(root).relative_to(config.base_dir))
+            rel_root = "" if rel_root == "." else rel_root.replace(os.sep, "/")
+            root_hidden = is_path_hidden(Path(rel_root), config)
+
+            # prune hidden and gitignored directories so their contents are never listed.
             dirs[:] = [
                 d for d in dirs
-                if not is_path_hidden(Path(root, d).relative_to(config.base_dir), config)
+                if not (root_hidden or is_name_hidden(d, config))
+                and (include_dir_prefixes is None
+                     or dir_may_contain_includes(f"{rel_root}/{d}" if rel_root else d, include_dir_prefixes))
+                and not is_path_gitignored(Path(root, d), config, gitignore_cache, is_dir=True)
             ]
 
+            if root_hidden:
+                continue
+
             for file_name in files:
-                file_path = Path(root, file_name)
-                rel_path = file_path.relative_to(config.base_dir)
-                path_str = rel_path.as_posix()
+                if is_name_hidden(file_name, config):
+                    continue
 
-                if is_path_hidden(rel_path, config):
+                path_str = f"{rel_root}/{file_name}" if rel_root else file_name
+                # cheap pattern checks first; the gitignore walk needs a Path.
+                if not include_spec.match_file(path_str):
                     continue
-                if is_path_gitignored(file_path, config, gitignore_cache):
+                if exclude_spec and exclude_spec.match_file(path_str):
                     continue
 
-                if include_spec.match_file(path_str):
-                    if not (exclude_spec and exclude_spec.match_file(path_str)):
-                        # Apply git filter if specified
-                        if git_modified_files is not None and file_path not in git_modified_files:
-                            continue
-                        if file_path not in yielded_files:
-                            yield file_path
-                            yielded_files.add(file_path)
-
+                file_path = Path(root, file_name)
+                if is_path_gitignored(file_path, config, gitignore_cache):
+                    continue
+                if file_path not in yielded_files:
+                    yield file_path
+                    yielded_files.add(file_path)
 
 def grep_files_for_content(config: PromptConfig) -> Iterator[Path]:
     """
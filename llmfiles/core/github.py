@@ -7,7 +7,9 @@ to temporary directories for processing.
 
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
 import structlog
 
@@ -24,6 +26,9 @@ GITHUB_URL_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Upper bound on concurrent `git clone` processes.
+MAX_PARALLEL_CLONES = 4
+
 
 def is_github_url(path_str: str) -> bool:
     """Check if string is a GitHub repository URL.
@@ -92,3 +97,26 @@ def clone_github_repo(url: str, target_dir: Path) -> Path:
         raise GitError("git command not found - please install git")
     except OSError as e:
         raise GitError(f"failed to run git command: {e}")
+
+
+def clone_github_repos(urls: List[str], target_dirs: List[Path]) -> List[Path]:
+    """Clone several GitHub repositories concurrently.
+
+    Each clone is network-bound and runs in its own `git` process, so
+    cloning in parallel overlaps their latency.
+
+    Args:
+        urls: GitHub repository URLs
+        target_dirs: Directory to clone each URL into, in the same order
+
+    Returns:
+        Paths to the cloned repositories, in the same order as `urls`
+
+    Raises:
+        GitError: If any clone fails
+    """
+    if len(urls) <= 1:
+        return [clone_github_repo(url, target_dir) for url, target_dir in zip(urls, target_dirs)]
+
+    with ThreadPoolExecutor(max_workers=min(len(urls), MAX_PARALLEL_CLONES)) as executor:
+        return list(executor.map(clone_github_repo, urls, target_dirs))
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 import structlog
@@ -5,9 +6,27 @@ from llmfiles.exceptions import OutputError
 
 log = structlog.get_logger(__name__)
 
+# prompts above this size skip the text layer and go to the byte buffer in one write.
+STDOUT_BYTES_FAST_PATH_MIN_CHARS = 64 * 1024
+
+def _stdout_accepts_utf8_bytes() -> bool:
+    # true when stdout exposes a byte buffer, encodes as utf-8 anyway and does no
+    # newline translation, so writing the encoded bytes gives what the text layer would.
+    encoding = getattr(sys.stdout, "encoding", None) or ""
+    return (
+        os.linesep == "\n"
+        and hasattr(sys.stdout, "buffer")
+        and encoding.lower().replace("_", "-") in ("utf-8", "utf8")
+    )
+
 def write_to_stdout(text_content: str):
     # writes text to standard output.
     try:
+        if len(text_content) >= STDOUT_BYTES_FAST_PATH_MIN_CHARS and _stdout_accepts_utf8_bytes():
+            sys.stdout.flush()
+            sys.stdout.buffer.write(text_content.encode("utf-8"))
+            sys.stdout.buffer.flush()
+            return
         sys.stdout.write(text_content)
         sys.stdout.flush()
     except Exception as e:
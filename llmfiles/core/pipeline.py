@@ -1,21 +1,25 @@
 # llmfiles/core/pipeline.py
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.console import Console as RichConsole
 import structlog
 import logging as stdlib_logging
 
 import collections
-from llmfiles.config.settings import PromptConfig, ExternalDepsStrategy, OutputFormat
+import functools
+import itertools
+from llmfiles.config.settings import PromptConfig, ChunkStrategy, ExternalDepsStrategy, OutputFormat
 from llmfiles.core.discovery.walker import discover_paths, grep_files_for_content
 from llmfiles.core.processing import process_file_content_to_elements
 from llmfiles.exceptions import SmartPromptBuilderError
 from llmfiles.structured_processing.language_parsers.python_parser import extract_python_imports
 from llmfiles.core.discovery.dependency_resolver import resolve_import
-from llmfiles.core.import_tracer import CallTracer
+from llmfiles.structured_processing import ast_utils
+from llmfiles.util import get_language_hint, relative_path_str
 
 log = structlog.get_logger(__name__)
 
@@ -27,9 +31,40 @@ INSTALLED_PACKAGES = {
     "tree-sitter", "tree-sitter-language-pack"
 }
 
+# below this many files the thread pool costs more than the reads it overlaps.
+PARALLEL_PROCESSING_MIN_FILES = 8
+
+# files submitted to the pool ahead of the one being consumed, per worker.
+PROCESSING_WINDOW_PER_WORKER = 8
+
+# processing progress is pushed to the bar every N files or every interval, whichever comes first.
+PROGRESS_UPDATE_EVERY_N_FILES = 64
+PROGRESS_UPDATE_INTERVAL_S = 0.1
+
+# redraw rate for the rich bar; rich's default of 10/s mostly redraws an unchanged spinner.
+PROGRESS_REFRESH_PER_SECOND = 4
+
+
+class _NullProgress:
+    # stand-in for rich's Progress when the bar would be disabled anyway; skips
+    # building the console and the per-update locking and task bookkeeping.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def add_task(self, *args, **kwargs) -> int:
+        return 0
+
+    def update(self, *args, **kwargs) -> None:
+        pass
+
 
 class PromptGenerator:
     # orchestrates the prompt generation pipeline.
+    __slots__ = ("call_graph_summary", "config", "content_elements", "external_dependencies", "log")
+
     def __init__(self, config: PromptConfig):
         self.config: PromptConfig = config
         self.log = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
@@ -37,12 +72,19 @@ class PromptGenerator:
         self.external_dependencies: Dict[str, Set[str]] = collections.defaultdict(set)
         self.call_graph_summary: Optional[str] = None
 
-    def _render_final_output(self) -> str:
+    def _group_elements_by_file(self) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """Groups content elements by file path; returns the groups and the sorted paths."""
+        elements_by_file = collections.defaultdict(list)
+        for el in self.content_elements:
+            elements_by_file[el["file_path"]].append(el)
+        return elements_by_file, sorted(elements_by_file.keys())
+
+    def _render_final_output(self, elements_by_file: dict, sorted_file_paths: list) -> str:
         """Renders the collected content elements into the final markdown string."""
         if self.config.output_format == OutputFormat.COMPACT:
-            return self._render_compact_output()
+            return self._render_compact_output(elements_by_file, sorted_file_paths)
         else:
-            return self._render_verbose_output()
+            return self._render_verbose_output(elements_by_file, sorted_file_paths)
 
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
@@ -72,7 +114,7 @@ class PromptGenerator:
             lines.append(f"| {file_path} | {size} | {line_count} | {desc} |")
         return "\n".join(lines)
 
-    def _render_compact_output(self) -> str:
+    def _render_compact_output(self, elements_by_file: dict, sorted_file_paths: list) -> str:
         """Render output in compact format optimized for LLM consumption."""
         output_parts = []
         project_root_name = self.config.base_dir.name or str(self.config.base_dir)
@@ -80,12 +122,6 @@ class PromptGenerator:
         # 1. Header
         output_parts.append(f"# {project_root_name}\n")
 
-        # Group elements by file path
-        elements_by_file = collections.defaultdict(list)
-        for el in self.content_elements:
-            elements_by_file[el["file_path"]].append(el)
-        sorted_file_paths = sorted(elements_by_file.keys())
-
         # 2. File Index Table
         if sorted_file_paths:
             output_parts.append(self._render_file_index(elements_by_file, sorted_file_paths))
@@ -108,7 +144,7 @@ class PromptGenerator:
 
         return "\n".join(output_parts)
 
-    def _render_verbose_output(self) -> str:
+    def _render_verbose_output(self, elements_by_file: dict, sorted_file_paths: list) -> str:
         """Render output in verbose/legacy format with full metadata upfront."""
         output_parts = []
         project_root_name = self.config.base_dir.name or str(self.config.base_dir)
@@ -120,13 +156,6 @@ class PromptGenerator:
             output_parts.append("")
             output_parts.append(self.call_graph_summary)
 
-        # Group elements by file path to structure the output
-        elements_by_file = collections.defaultdict(list)
-        for el in self.content_elements:
-            elements_by_file[el["file_path"]].append(el)
-
-        sorted_file_paths = sorted(elements_by_file.keys())
-
         if sorted_file_paths:
             tree_lines = [f"{project_root_name}/"]
             for i, path_str in enumerate(sorted_file_paths):
@@ -145,7 +174,7 @@ class PromptGenerator:
 
                 # Add external dependency metadata if requested
                 if self.config.external_deps_strategy == ExternalDepsStrategy.METADATA and file_path in self.external_dependencies:
-                    deps = sorted(list(self.external_dependencies[file_path]))
+                    deps = sorted(self.external_dependencies[file_path])
                     if deps:
                         output_parts.append("external dependencies:")
                         for dep in deps:
@@ -193,6 +222,7 @@ class PromptGenerator:
                 self.log.warning("failed_to_extract_imports", file=str(current_file), error=str(e))
                 continue
 
+            rel_path_str = None
             for import_name in imports:
                 status, result = resolve_import(import_name, self.config.base_dir, INSTALLED_PACKAGES)
 
@@ -203,82 +233,175 @@ class PromptGenerator:
                         processed_files.add(new_file_path)
                         worklist.append(new_file_path)
                 elif status in ["external", "stdlib"]:
-                    rel_path_str = str(current_file.relative_to(self.config.base_dir))
+                    if rel_path_str is None:
+                        rel_path_str = relative_path_str(current_file, self.config.base_dir) or str(
+                            current_file.relative_to(self.config.base_dir)
+                        )
                     self.external_dependencies[rel_path_str].add(result)
 
-        return sorted(list(processed_files))
+        return sorted(processed_files)
 
+    def _preload_grammars_as_discovered(self, paths: Iterable[Path]) -> Iterator[Path]:
+        """Passes paths through, starting a grammar's background load at its first file.
+
+        Only languages this run will parse with are loaded: every registered one
+        under structure chunking, Python alone for --recursive import extraction.
+        Each load overlaps with the rest of the walk.
+        """
+        if self.config.chunk_strategy == ChunkStrategy.STRUCTURE:
+            pending_languages = set(ast_utils.LANG_CONFIG_TS)
+        elif self.config.recursive:
+            pending_languages = {"python"} & set(ast_utils.LANG_CONFIG_TS)
+        else:
+            pending_languages = set()
+
+        for file_path in paths:
+            if pending_languages:
+                language = get_language_hint(file_path.suffix)
+                if language in pending_languages:
+                    pending_languages.discard(language)
+                    ast_utils.preload_languages_in_background([language])
+            yield file_path
+
+    def _process_files(self, paths: Iterable[Path]) -> Iterator[Tuple[Path, List[Dict[str, Any]]]]:
+        """Processes files into content elements, yielding results in input order.
+
+        File reads dominate, so larger runs overlap them on a thread pool. Only a
+        bounded window of files is in flight at once, so huge runs do not queue a
+        future per file up front. `paths` may be a lazy iterator, in which case
+        files are processed while it is still producing.
+        """
+        process_file = functools.partial(process_file_content_to_elements, config=self.config)
+        max_workers = self.config.read_threads or min(32, (os.cpu_count() or 1) * 4)
+        paths = iter(paths)
+        head = list(itertools.islice(paths, PARALLEL_PROCESSING_MIN_FILES))
+        if max_workers == 1 or len(head) < PARALLEL_PROCESSING_MIN_FILES:
+            for file_path in itertools.chain(head, paths):
+                yield file_path, process_file(file_path)
+            return
+
+        window = max_workers * PROCESSING_WINDOW_PER_WORKER
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = collections.deque()
+            for file_path in itertools.chain(head, paths):
+                pending.append((file_path, executor.submit(process_file, file_path)))
+                if len(pending) >= window:
+                    done_path, future = pending.popleft()
+                    yield done_path, future.result()
+            while pending:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
 
     def generate(self) -> Tuple[str, List[Dict[str, Any]]]:
         # runs the full pipeline and returns the final prompt and list of included files with metadata.
         app_log_level = stdlib_logging.getLogger("llmfiles").getEffectiveLevel()
         progress_disabled = app_log_level > stdlib_logging.INFO or not sys.stderr.isatty()
-        stderr_console = RichConsole(file=sys.stderr)
-
-        with Progress(
-            SpinnerColumn(), TextColumn("[bold blue]{task.description}"), BarColumn(),
-            transient=True, disable=progress_disabled, console=stderr_console
-        ) as progress:
-
-            discover_task = progress.add_task("discovering seed files...", total=None)
-
-            # Determine the seeding strategy
-            if self.config.grep_content_pattern:
-                # Grep mode: seeds are determined by content search
-                seed_files = list(grep_files_for_content(self.config))
-            else:
-                # Standard mode: seeds are from paths and patterns
-                seed_files = list(discover_paths(self.config))
-            progress.update(discover_task, completed=True, description=f"discovered {len(seed_files)} seed files.")
-
-            # Conditional dependency resolution
-            if self.config.follow_deps or self.config.trace_calls:
-                # AST-based import tracing (Python only)
-                # Determine if filtering is enabled
-                filter_unused = self.config.filter_unused_imports and not self.config.trace_calls
-                task_desc = "tracing imports with filtering..." if filter_unused else "tracing all imports..."
-                trace_task = progress.add_task(task_desc, total=None)
-                tracer = CallTracer(
-                    project_root=self.config.base_dir,
-                    filter_unused=filter_unused,
-                )
-                paths_to_process = tracer.trace_all(seed_files)
-                self.call_graph_summary = tracer.get_call_graph_summary()
-                # Include skipped import count in status if filtering was used
-                skipped_count = len(tracer.skipped_imports)
-                if filter_unused and skipped_count > 0:
-                    progress.update(trace_task, completed=True, description=f"traced {len(paths_to_process)} files (filtered {skipped_count} unused imports).")
+        if progress_disabled:
+            progress_display = _NullProgress()
+        else:
+            # rich.progress is only imported when a bar will actually be drawn.
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+            from rich.console import Console as RichConsole
+
+            progress_display = Progress(
+                SpinnerColumn(), TextColumn("[bold blue]{task.description}"), BarColumn(),
+                transient=True, console=RichConsole(file=sys.stderr),
+                refresh_per_second=PROGRESS_REFRESH_PER_SECOND,
+            )
+
+        try:
+            with progress_display as progress:
+
+                # one task for the whole run; each step only changes its description and total.
+                task = progress.add_task("discovering seed files...", total=None)
+
+                # Determine the seeding strategy
+                if self.config.grep_content_pattern:
+                    # Grep mode: seeds are determined by content search
+                    seed_source = grep_files_for_content(self.config)
                 else:
-                    progress.update(trace_task, completed=True, description=f"traced {len(paths_to_process)} files.")
-            elif self.config.recursive:
-                resolve_task = progress.add_task("resolving dependencies...", total=None)
-                paths_to_process = self._resolve_dependencies(seed_files)
-                progress.update(resolve_task, completed=True, description=f"total files to include: {len(paths_to_process)}")
-            else:
-                paths_to_process = seed_files
-
-            if paths_to_process:
-                processing_task = progress.add_task("processing content...", total=len(paths_to_process))
-                for file_path in paths_to_process:
-                    elements_from_file = process_file_content_to_elements(file_path, self.config)
-                    self.content_elements.extend(elements_from_file)
-                    progress.update(processing_task, advance=1, description=f"processing {file_path.name}")
+                    # Standard mode: seeds are from paths and patterns
+                    seed_source = discover_paths(self.config)
+                seed_source = self._preload_grammars_as_discovered(seed_source)
+
+                # dependency tracing needs the full seed list up front; otherwise the
+                # walk is streamed straight into processing so the two overlap.
+                needs_seed_list = self.config.follow_deps or self.config.trace_calls or self.config.recursive
+                if needs_seed_list:
+                    seed_files = list(seed_source)
+                    progress.update(task, description=f"discovered {len(seed_files)} seed files.")
+
+                # Conditional dependency resolution
+                if self.config.follow_deps or self.config.trace_calls:
+                    # AST-based import tracing (Python only)
+                    # Determine if filtering is enabled
+                    filter_unused = self.config.filter_unused_imports and not self.config.trace_calls
+                    task_desc = "tracing imports with filtering..." if filter_unused else "tracing all imports..."
+                    progress.update(task, description=task_desc)
+                    # the import tracer is only needed with --deps.
+                    from llmfiles.core.import_tracer import CallTracer
+
+                    tracer = CallTracer(
+                        project_root=self.config.base_dir,
+                        filter_unused=filter_unused,
+                    )
+                    paths_to_process = tracer.trace_all(seed_files)
+                    self.call_graph_summary = tracer.get_call_graph_summary()
+                    # Include skipped import count in status if filtering was used
+                    skipped_count = len(tracer.skipped_imports)
+                    if filter_unused and skipped_count > 0:
+                        progress.update(task, description=f"traced {len(paths_to_process)} files (filtered {skipped_count} unused imports).")
+                    else:
+                        progress.update(task, description=f"traced {len(paths_to_process)} files.")
+                elif self.config.recursive:
+                    # import extraction parses each python file; structure chunking would
+                    # parse it again, so keep the trees around for the second pass.
+                    ast_utils.set_tree_retention(self.config.chunk_strategy == ChunkStrategy.STRUCTURE)
+                    progress.update(task, description="resolving dependencies...")
+                    paths_to_process = self._resolve_dependencies(seed_files)
+                    # only trees from import extraction get reused; stop keeping new ones.
+                    ast_utils.set_tree_retention(False)
+                    progress.update(task, description=f"total files to include: {len(paths_to_process)}")
+                else:
+                    paths_to_process = seed_source
+
+                if not needs_seed_list or paths_to_process:
+                    total = len(paths_to_process) if needs_seed_list else None
+                    progress.update(task, total=total, completed=0, description="processing content...")
+                    # rich redraws at most ~10 times a second, so progress is reported in
+                    # batches; per-file names are bound to locals outside the loop.
+                    add_elements = self.content_elements.extend
+                    monotonic = time.monotonic
+                    update_every, update_interval = PROGRESS_UPDATE_EVERY_N_FILES, PROGRESS_UPDATE_INTERVAL_S
+                    pending_advance = 0
+                    last_update = monotonic()
+                    for file_path, elements_from_file in self._process_files(paths_to_process):
+                        add_elements(elements_from_file)
+                        pending_advance += 1
+                        now = monotonic()
+                        if pending_advance >= update_every or now - last_update >= update_interval:
+                            progress.update(task, advance=pending_advance, description=f"processing {file_path.name}")
+                            pending_advance = 0
+                            last_update = now
+                    if pending_advance:
+                        progress.update(task, advance=pending_advance)
+        finally:
+            # retention is switched on for --recursive runs; never leave it on (or trees
+            # held) if resolution or processing raises.
+            ast_utils.set_tree_retention(False)
+            ast_utils.clear_retained_trees()
 
         if not self.content_elements:
             return "", []
 
-        final_output = self._render_final_output()
+        # The renderer and the included-files summary share one grouping pass.
+        elements_by_file, sorted_file_paths = self._group_elements_by_file()
+        final_output = self._render_final_output(elements_by_file, sorted_file_paths)
 
         # Build file info dict with path and size
-        file_info_map = {}
-        for el in self.content_elements:
-            file_path = el["file_path"]
-            if file_path not in file_info_map:
-                file_info_map[file_path] = {
-                    "path": file_path,
-                    "size_bytes": el.get("file_size_bytes", 0)
-                }
-
-        unique_files_info = sorted(file_info_map.values(), key=lambda x: x["path"])
+        unique_files_info = [
+            {"path": file_path, "size_bytes": elements_by_file[file_path][0].get("file_size_bytes", 0)}
+            for file_path in sorted_file_paths
+        ]
 
         return final_output, unique_files_info
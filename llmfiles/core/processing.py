@@ -6,7 +6,7 @@ from typing import List, Dict, Any, Optional
 from llmfiles.config.settings import PromptConfig, ChunkStrategy
 from llmfiles.structured_processing.language_parsers import python_parser, javascript_parser
 from llmfiles.structured_processing import ast_utils
-from llmfiles.util import strip_utf8_bom, get_language_hint
+from llmfiles.util import strip_utf8_bom, get_language_hint, relative_path_str
 
 log = structlog.get_logger(__name__)
 
@@ -89,9 +89,8 @@ def process_file_content_to_elements(file_path: Path, config: PromptConfig) -> L
         log.info("skipping_empty_file", path=str(file_path))
         return elements
 
-    file_rel_path_str = str(file_path.relative_to(config.base_dir) if file_path.is_relative_to(config.base_dir) else file_path.name)
-    file_lang_ext = file_path.suffix[1:].lower()
-    file_lang_hint = get_language_hint(file_lang_ext)
+    file_rel_path_str = relative_path_str(file_path, config.base_dir) or file_path.name
+    file_lang_hint = get_language_hint(file_path.suffix)
 
     use_structure_chunking = (
         config.chunk_strategy == ChunkStrategy.STRUCTURE and
@@ -136,7 +135,6 @@ def process_file_content_to_elements(file_path: Path, config: PromptConfig) -> L
             "end_line": line_count,
             "line_count": line_count,
             "description": description,
-            "raw_content": base_text_content,
             "llm_formatted_content": formatted_content,
             "name": file_path.name,
             "qualified_name": file_rel_path_str,
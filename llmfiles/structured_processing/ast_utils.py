@@ -1,14 +1,24 @@
 # llmfiles/structured_processing/ast_utils.py
-from tree_sitter import Parser, Language, Node, Query, QueryCursor
+from tree_sitter import Parser, Language, Node, Query, QueryCursor, Tree
 from typing import Dict, Any, Optional, List, Tuple
+import hashlib
+import re
 import textwrap
+import threading
 import structlog
 
 log = structlog.get_logger(__name__)
 
 LANG_CONFIG_TS: Dict[str, Dict[str, Any]] = {}
-PARSERS_TS: Dict[str, Parser] = {}
-QUERIES_COMPILED_TS: Dict[str, Dict[str, Any]] = {}
+# per language: one Query compiled from all of its configured queries, plus the
+# query key each capture name belongs to.
+QUERIES_COMPILED_TS: Dict[str, Tuple[Query, Dict[str, str]]] = {}
+_CAPTURE_NAME_RE = re.compile(r"@([\w.]+)")
+
+# tree-sitter Parser objects are not safe to share between threads, so each thread
+# gets its own. grammars and compiled queries are immutable and shared by all threads.
+_thread_local = threading.local()
+_init_lock = threading.Lock()
 
 LANGUAGE_PROVIDER_MODULE_NAME = "tree_sitter_language_pack"
 
@@ -21,7 +31,53 @@ try:
 except ImportError:
     log.error("failed_to_import_tree_sitter_language_provider", module_name=LANGUAGE_PROVIDER_MODULE_NAME)
 
+# static per-language metadata. kept at module level so it is built once per
+# process; loading a language only has to bind the grammar object.
+LANGUAGE_SPECS: Dict[str, Dict[str, Any]] = {
+    "python": {
+        "queries": {
+            "functions": """
+                (module
+                  (function_definition name: (identifier) @function.name) @function.definition)
+            """,
+            "classes": "(class_definition name: (identifier) @class.name) @class.definition",
+            "imports": """
+                [
+                  (import_statement name: (dotted_name) @import)
+                  (import_statement name: (aliased_import name: (dotted_name) @import))
+                  (import_from_statement module_name: (dotted_name) @import)
+                ]
+            """
+        },
+        "node_types": {
+             "function_definition": "function_definition",
+             "class_definition": "class_definition", "identifier": "identifier",
+             "block": "block", "string": "string", "expression_statement": "expression_statement",
+        }
+    },
+    "javascript": {
+        "queries": {
+            "functions": """
+                [
+                  (function_declaration name: (identifier) @function.name) @function.definition
+                  (arrow_function) @function.definition
+                  (method_definition name: (property_identifier) @method.name) @method.definition
+                ]
+            """,
+            "classes": "(class_declaration name: (identifier) @class.name) @class.definition",
+        },
+        "node_types": {
+            "function_declaration": "function_declaration", "arrow_function": "arrow_function",
+            "method_definition": "method_definition", "class_declaration": "class_declaration",
+            "identifier": "identifier", "property_identifier": "property_identifier",
+            "statement_block": "statement_block", "comment": "comment", "variable_declarator": "variable_declarator",
+        }
+    },
+}
+
 def load_language_configs_for_llmfiles():
+    # registers every known language without loading its grammar. grammars are
+    # bound lazily by _ensure_parser_initialized on the first parse of that language.
     global LANG_CONFIG_TS
     if LANG_CONFIG_TS:
         return
@@ -30,120 +86,234 @@ def load_language_configs_for_llmfiles():
         log.error("cannot_load_language_configs_provider_unavailable")
         return
 
-    log.info("initializing_tree_sitter_language_configurations")
+    log.info("registering_tree_sitter_language_configurations", languages=list(LANGUAGE_SPECS))
+    for lang_name, spec in LANGUAGE_SPECS.items():
+        LANG_CONFIG_TS[lang_name] = {"ts_language_object": None, "load_failed": False, **spec}
 
+def _load_grammar(lang_name: str) -> Optional[Language]:
+    # loads the grammar for a registered language and resolves its kind ids. the
+    # grammar is not published to LANG_CONFIG_TS here; caller holds _init_lock.
+    config = LANG_CONFIG_TS[lang_name]
     try:
-        py_lang_obj: Optional[Language] = _get_language_from_provider("python")
-        if py_lang_obj:
-            LANG_CONFIG_TS["python"] = {
-                "ts_language_object": py_lang_obj,
-                "queries": {
-                    "functions": """
-                        (module
-                          (function_definition name: (identifier) @function.name) @function.definition)
-                    """,
-                    "classes": "(class_definition name: (identifier) @class.name) @class.definition",
-                    "imports": """
-                        [
-                          (import_statement name: (dotted_name) @import)
-                          (import_statement name: (aliased_import name: (dotted_name) @import))
-                          (import_from_statement module_name: (dotted_name) @import)
-                        ]
-                    """
-                },
-                "node_types": {
-                     "function_definition": "function_definition",
-                     "class_definition": "class_definition", "identifier": "identifier",
-                     "block": "block", "string": "string", "expression_statement": "expression_statement",
-                }
-            }
+        ts_lang_obj = _get_language_from_provider(lang_name)
+        # resolve the node type names we check against to integer kind ids once,
+        # so is_node_type compares ints instead of strings.
+        config["kind_ids"] = {
+            type_key: ts_lang_obj.id_for_node_kind(type_name, True)
+            for type_key, type_name in config.get("node_types", {}).items()
+        }
+        log.debug("tree_sitter_language_loaded", lang=lang_name)
+        return ts_lang_obj
     except Exception as e:
-        log.warning("failed_to_load_python_language_config", error=str(e))
+        log.warning(f"failed_to_load_{lang_name}_language_config", error=str(e))
+        return None
 
+def _compile_queries(lang_name: str, ts_lang_obj: Language) -> None:
+    # compiles all configured queries of a language into a single Query, once per
+    # process. capture names must be unique to one query key so results can be split
+    # back out by key. caller holds _init_lock.
+    if lang_name in QUERIES_COMPILED_TS:
+        return
+    queries: Dict[str, str] = LANG_CONFIG_TS[lang_name].get("queries", {})
+    capture_keys: Dict[str, str] = {}
+    for query_name, query_string in queries.items():
+        for capture_name in _CAPTURE_NAME_RE.findall(query_string):
+            if capture_keys.setdefault(capture_name, query_name) != query_name:
+                log.warning("query_capture_name_shared", lang=lang_name, capture=capture_name)
     try:
-        js_lang_obj: Optional[Language] = _get_language_from_provider("javascript")
-        if js_lang_obj:
-            LANG_CONFIG_TS["javascript"] = {
-                "ts_language_object": js_lang_obj,
-                "queries": {
-                    "functions": """
-                        [
-                          (function_declaration name: (identifier) @function.name) @function.definition
-                          (arrow_function) @function.definition
-                          (method_definition name: (property_identifier) @method.name) @method.definition
-                        ]
-                    """,
-                    "classes": "(class_declaration name: (identifier) @class.name) @class.definition",
-                },
-                "node_types": {
-                    "function_declaration": "function_declaration", "arrow_function": "arrow_function",
-                    "method_definition": "method_definition", "class_declaration": "class_declaration",
-                    "identifier": "identifier", "property_identifier": "property_identifier",
-                    "statement_block": "statement_block", "comment": "comment", "variable_declarator": "variable_declarator",
-                }
-            }
+        combined = Query(ts_lang_obj, "\n".join(queries.values()))
     except Exception as e:
-        log.warning("failed_to_load_javascript_language_config", error=str(e))
+        # one bad query must not disable the rest: find the ones that compile on their
+        # own and combine just those.
+        log.warning("failed_to_compile_combined_query", lang=lang_name, error=str(e))
+        valid_queries: Dict[str, str] = {}
+        for query_name, query_string in queries.items():
+            try:
+                Query(ts_lang_obj, query_string)
+            except Exception as query_error:
+                log.warning("failed_to_compile_query", lang=lang_name, query=query_name, error=str(query_error))
+            else:
+                valid_queries[query_name] = query_string
+        if not valid_queries:
+            return
+        combined = Query(ts_lang_obj, "\n".join(valid_queries.values()))
+        capture_keys = {
+            capture_name: query_name for capture_name, query_name in capture_keys.items()
+            if query_name in valid_queries
+        }
+    QUERIES_COMPILED_TS[lang_name] = (combined, capture_keys)
+
+def _prepare_language(lang_name: str) -> Optional[Language]:
+    # binds the grammar and compiles queries for a registered language, once per process.
+    # a failed load is remembered, so it is attempted and logged only once.
+    with _init_lock:
+        config = LANG_CONFIG_TS[lang_name]
+        if config["ts_language_object"] is None and not config["load_failed"]:
+            ts_lang_obj = _load_grammar(lang_name)
+            if ts_lang_obj is None:
+                config["load_failed"] = True
+            else:
+                _compile_queries(lang_name, ts_lang_obj)
+                # published last: get_lang_obj reads this without the lock, so a grammar
+                # must never be visible before its queries are compiled.
+                config["ts_language_object"] = ts_lang_obj
+        return config["ts_language_object"]
+
+def get_lang_obj(lang_name: str) -> Optional[Language]:
+    # one lookup for a registered language's grammar, binding it on first use.
+    config = LANG_CONFIG_TS.get(lang_name)
+    if config is None or config["load_failed"]:
+        return None
+    return config["ts_language_object"] or _prepare_language(lang_name)
+
+def _preload_languages(lang_names: List[str]) -> None:
+    for lang_name in lang_names:
+        _prepare_language(lang_name)
+
+def preload_languages_in_background(lang_names: List[str]) -> Optional[threading.Thread]:
+    # starts preparing the given languages on a daemon thread so grammar loading
+    # overlaps with file discovery. a parse that arrives first just waits on the lock.
+    registered = [lang_name for lang_name in lang_names if lang_name in LANG_CONFIG_TS]
+    if not registered:
+        return None
+    thread = threading.Thread(
+        target=_preload_languages, args=(registered,), name="llmfiles-grammar-preload", daemon=True
+    )
+    thread.start()
+    log.debug("tree_sitter_preload_started", languages=registered)
+    return thread
 
 def _ensure_parser_initialized(lang_name: str) -> Optional[Parser]:
-    if lang_name not in PARSERS_TS:
-        if lang_name not in LANG_CONFIG_TS:
+    # returns this thread's parser for lang_name, creating it on first use.
+    parsers: Optional[Dict[str, Parser]] = getattr(_thread_local, "parsers", None)
+    if parsers is None:
+        parsers = _thread_local.parsers = {}
+    if lang_name not in parsers:
+        ts_lang_obj = get_lang_obj(lang_name)
+        if ts_lang_obj is None:
             return None
         try:
             parser = Parser()
-            ts_lang_obj = LANG_CONFIG_TS[lang_name]["ts_language_object"]
             parser.language = ts_lang_obj
-            PARSERS_TS[lang_name] = parser
-
-            QUERIES_COMPILED_TS[lang_name] = {}
-            for query_name, query_string in LANG_CONFIG_TS[lang_name].get("queries", {}).items():
-                try:
-                    QUERIES_COMPILED_TS[lang_name][query_name] = ts_lang_obj.query(query_string)
-                except Exception as e:
-                    log.warning("failed_to_compile_query", lang=lang_name, query=query_name, error=str(e))
+            parsers[lang_name] = parser
         except Exception as e:
             log.error("parser_initialization_failed", lang=lang_name, error=str(e))
             return None
-    return PARSERS_TS.get(lang_name)
+    return parsers.get(lang_name)
 
-def parse_code_to_ast(content_bytes: bytes, language_name: str) -> Optional[Node]:
+# the same file can be parsed twice in one run (import extraction for --recursive,
+# then structure chunking). while retention is on, each new tree is kept under a
+# digest of its source and handed back once, on the next parse of that source; the
+# entry is dropped on reuse, so no tree or source outlives its second use.
+_retain_trees = False
+_retained_trees: Dict[Tuple[str, bytes], Tree] = {}
+
+def _parse_uncached(content_bytes: bytes, language_name: str) -> Optional[Tree]:
     parser = _ensure_parser_initialized(language_name)
     if not parser: return None
     try:
-        return parser.parse(content_bytes).root_node
+        return parser.parse(content_bytes)
     except Exception as e:
         log.error("code_parsing_failed", lang=language_name, error=str(e))
         return None
 
+def _tree_key(content_bytes: bytes, language_name: str) -> Tuple[str, bytes]:
+    return language_name, hashlib.blake2b(content_bytes, digest_size=16).digest()
+
+def set_tree_retention(enabled: bool) -> None:
+    # starts or stops keeping newly parsed trees. trees already kept stay available
+    # for their one reuse until clear_retained_trees().
+    global _retain_trees
+    _retain_trees = enabled
+
+def clear_retained_trees() -> None:
+    _retained_trees.clear()
+
+def parse_code_to_ast(content_bytes: bytes, language_name: str) -> Optional[Node]:
+    if language_name not in LANG_CONFIG_TS:
+        return None
+    tree = None
+    if _retain_trees or _retained_trees:
+        key = _tree_key(content_bytes, language_name)
+        tree = _retained_trees.pop(key, None)
+    if tree is None:
+        tree = _parse_uncached(content_bytes, language_name)
+        if _retain_trees and tree is not None:
+            _retained_trees[key] = tree
+    return tree.root_node if tree else None
+
 def get_node_text(node: Optional[Node], content_bytes: bytes) -> str:
     if node:
         return content_bytes[node.start_byte:node.end_byte].decode('utf-8', 'replace')
     return ""
 
-def run_query(query_key: str, lang_name: str, node: Node) -> List[Tuple[Node, str]]:
-    query_obj = QUERIES_COMPILED_TS.get(lang_name, {}).get(query_key)
-    if not query_obj:
-        return []
+def run_queries(query_keys: List[str], lang_name: str, node: Node) -> Dict[str, List[Tuple[Node, str]]]:
+    # runs the language's combined query once and splits the captures by query key.
+    results: Dict[str, List[Tuple[Node, str]]] = {key: [] for key in query_keys}
+    compiled = QUERIES_COMPILED_TS.get(lang_name)
+    if not compiled:
+        return results
+    query_obj, capture_keys = compiled
     try:
         # tree-sitter 0.25+ API: use QueryCursor
         cursor = QueryCursor(query_obj)
         captures_dict = cursor.captures(node)
-        result = []
         for capture_name, nodes in captures_dict.items():
-            for n in nodes:
-                result.append((n, capture_name))
-        return result
+            key_results = results.get(capture_keys.get(capture_name, ""))
+            if key_results is not None:
+                key_results.extend((n, capture_name) for n in nodes)
+        return results
     except Exception as e:
-        log.error("tree_sitter_query_execution_failed", query=query_key, lang=lang_name, error=str(e))
-        return []
+        log.error("tree_sitter_query_execution_failed", queries=query_keys, lang=lang_name, error=str(e))
+        return {key: [] for key in query_keys}
+
+def run_query(query_key: str, lang_name: str, node: Node) -> List[Tuple[Node, str]]:
+    return run_queries([query_key], lang_name, node)[query_key]
+
+# node type names repeat constantly within a tree; encode each one only once.
+_NODE_TYPE_BYTES: Dict[str, bytes] = {}
+
+def _node_type_bytes(node_type: str) -> bytes:
+    encoded = _NODE_TYPE_BYTES.get(node_type)
+    if encoded is None:
+        encoded = _NODE_TYPE_BYTES[node_type] = node_type.encode()
+    return encoded
+
+def sexp_prefix(node: Node, max_chars: int) -> str:
+    # renders at most max_chars of the node's s-expression. unlike str(node), which
+    # builds the text for the whole subtree, the walk stops once the budget is used.
+    buf = bytearray()
+    cursor = node.walk()
+    while len(buf) < max_chars:
+        current = cursor.node
+        if current.is_named:
+            if buf:
+                buf += b" "
+            field_name = cursor.field_name
+            if field_name:
+                buf += _node_type_bytes(field_name) + b": "
+            buf += b"(" + _node_type_bytes(current.type)
+        if cursor.goto_first_child():
+            continue
+        if current.is_named:
+            buf += b")"
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return buf[:max_chars].decode("utf-8", "replace")
+            if cursor.node.is_named:
+                buf += b")"
+    return buf[:max_chars].decode("utf-8", "replace")
 
 def get_node_type(lang_name: str, type_key: str) -> Optional[str]:
     return LANG_CONFIG_TS.get(lang_name, {}).get("node_types", {}).get(type_key)
 
+def get_node_kind_id(lang_name: str, type_key: str) -> Optional[int]:
+    return LANG_CONFIG_TS.get(lang_name, {}).get("kind_ids", {}).get(type_key)
+
 def is_node_type(node: Optional[Node], lang_name: str, type_key: str) -> bool:
     if not node: return False
-    expected_type = get_node_type(lang_name, type_key)
-    return expected_type is not None and node.type == expected_type
+    expected_kind_id = get_node_kind_id(lang_name, type_key)
+    return expected_kind_id is not None and node.kind_id == expected_kind_id
 
 def find_child_by_field(node: Optional[Node], field_name: str) -> Optional[Node]:
     return node.child_by_field_name(field_name) if node else None
@@ -162,7 +332,7 @@ def get_js_doc_comment_nodes(node: Node) -> List[Node]:
     doc_comment_nodes: List[Node] = []
     sibling = node.prev_sibling
     while sibling:
-        if sibling.type == "comment":
+        if is_node_type(sibling, "javascript", "comment"):
             doc_comment_nodes.append(sibling)
         elif sibling.is_named:
             break
@@ -170,10 +340,11 @@ def get_js_doc_comment_nodes(node: Node) -> List[Node]:
     return list(reversed(doc_comment_nodes))
 
 def get_python_docstring(body_node: Optional[Node], content_bytes: bytes) -> Optional[str]:
-    if not body_node or not is_node_type(body_node, "python", "block") or not body_node.named_children:
+    # named_child(0) avoids building the full child list just to read its head.
+    if not body_node or not is_node_type(body_node, "python", "block") or not body_node.named_child_count:
         return None
 
-    first_statement = body_node.named_children[0]
+    first_statement = body_node.named_child(0)
     if is_node_type(first_statement, "python", "expression_statement"):
         string_node = first_statement.named_child(0)
         if string_node and is_node_type(string_node, "python", "string"):
@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 import structlog
 
 from llmfiles.structured_processing import ast_utils as ts
+from llmfiles.util import relative_path_str
 
 log = structlog.get_logger(__name__)
 LANG = "javascript"
@@ -37,14 +38,15 @@ def extract_javascript_elements(file_path: Path, project_root: Path, content_byt
     # parses a javascript file and extracts top-level functions and classes.
     # Methods are included in class source_code, not extracted separately.
     elements: List[Dict[str, Any]] = []
-    rel_path = str(file_path.relative_to(project_root))
+    rel_path = relative_path_str(file_path, project_root) or file_path.name
     ast = ts.parse_code_to_ast(content_bytes, LANG)
     if not ast:
         return elements
 
     processed_nodes = set()
 
-    captures = ts.run_query("functions", LANG, ast) + ts.run_query("classes", LANG, ast)
+    captures_by_query = ts.run_queries(["functions", "classes"], LANG, ast)
+    captures = captures_by_query["functions"] + captures_by_query["classes"]
 
     for node, capture_name in captures:
         if node.id in processed_nodes:
@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 import structlog
 
 from llmfiles.structured_processing import ast_utils as ts
+from llmfiles.util import relative_path_str
 
 log = structlog.get_logger(__name__)
 LANG = "python"
@@ -24,13 +25,14 @@ def _build_fqn(file_rel_path: str, el_name: str, class_name: Optional[str] = Non
 def extract_python_elements(file_path: Path, project_root: Path, content_bytes: bytes) -> List[Dict[str, Any]]:
     # parses a python file and extracts functions and classes.
     elements: List[Dict[str, Any]] = []
-    rel_path = str(file_path.relative_to(project_root))
+    rel_path = relative_path_str(file_path, project_root) or file_path.name
     ast = ts.parse_code_to_ast(content_bytes, LANG)
     if not ast:
         return elements
 
-    func_captures = ts.run_query("functions", LANG, ast)
-    class_captures = ts.run_query("classes", LANG, ast)
+    captures = ts.run_queries(["functions", "classes"], LANG, ast)
+    func_captures = captures["functions"]
+    class_captures = captures["classes"]
 
     for node, _ in func_captures:
         name_node = ts.find_child_by_field(node, "name")
@@ -81,4 +83,4 @@ def extract_python_imports(content_bytes: bytes) -> List[str]:
             imports.add(import_text)
 
     log.debug("extracted_python_imports", count=len(imports))
-    return sorted(list(imports))
+    return sorted(imports)
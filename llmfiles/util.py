@@ -1,3 +1,8 @@
+import functools
+import os
+from pathlib import Path
+from typing import Optional
+
 import structlog
 
 log = structlog.get_logger(__name__)
@@ -9,17 +14,31 @@ def strip_utf8_bom(data: bytes) -> bytes:
         return data[len(utf8_bom):]
     return data
 
+_EXTENSION_LANGUAGE_HINTS = {
+    "py": "python", "js": "javascript", "ts": "typescript", "java": "java",
+    "c": "c", "h": "c", "cpp": "cpp", "hpp": "cpp", "cs": "csharp", "go": "go",
+    "rb": "ruby", "php": "php", "swift": "swift", "kt": "kotlin", "rs": "rust",
+    "scala": "scala", "sh": "bash", "md": "markdown", "json": "json",
+    "yaml": "yaml", "yml": "yaml", "xml": "xml", "html": "html", "css": "css",
+    "sql": "sql", "dockerfile": "dockerfile", "toml": "toml", "ini": "ini",
+}
+
+@functools.lru_cache(maxsize=256)
 def get_language_hint(extension: str | None) -> str:
     # provides a language hint for markdown code blocks based on file extension.
+    # a repo has few distinct extensions, so results are cached per raw extension.
     if not extension:
         return ""
     ext = extension.lower().strip(".")
-    ext_map = {
-        "py": "python", "js": "javascript", "ts": "typescript", "java": "java",
-        "c": "c", "h": "c", "cpp": "cpp", "hpp": "cpp", "cs": "csharp", "go": "go",
-        "rb": "ruby", "php": "php", "swift": "swift", "kt": "kotlin", "rs": "rust",
-        "scala": "scala", "sh": "bash", "md": "markdown", "json": "json",
-        "yaml": "yaml", "yml": "yaml", "xml": "xml", "html": "html", "css": "css",
-        "sql": "sql", "dockerfile": "dockerfile", "toml": "toml", "ini": "ini",
-    }
-    return ext_map.get(ext, ext)
+    return _EXTENSION_LANGUAGE_HINTS.get(ext, ext)
+
+def relative_path_str(path: Path | str, base_dir: Path | str) -> Optional[str]:
+    # string-prefix equivalent of str(path.relative_to(base_dir)), without building Path objects.
+    # returns None when path is not under base_dir.
+    path_str, base_str = str(path), str(base_dir)
+    if path_str == base_str:
+        return "."
+    prefix = base_str if base_str.endswith(os.sep) else base_str + os.sep
+    if path_str.startswith(prefix):
+        return path_str[len(prefix):]
+    return None
@@ -0,0 +1,334 @@
+# tests/test_ast_utils.py
+"""Tests for tree-sitter language loading and AST helpers."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from llmfiles.structured_processing import ast_utils
+from llmfiles.structured_processing.language_parsers import python_parser
+
+ast_utils.load_language_configs_for_llmfiles()
+
+
+class TestLanguageConfigLoading:
+    """Tests for load_language_configs_for_llmfiles()."""
+
+    def test_registers_every_language_spec(self):
+        """Each entry in LANGUAGE_SPECS should be registered."""
+        for lang_name in ast_utils.LANGUAGE_SPECS:
+            assert lang_name in ast_utils.LANG_CONFIG_TS
+
+    def test_grammars_bind_lazily_on_first_parse(self, monkeypatch):
+        """Only the language actually parsed should have its grammar loaded."""
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "_thread_local", threading.local())
+        ast_utils.clear_retained_trees()
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        ast_utils.load_language_configs_for_llmfiles()
+
+        assert ast_utils.LANG_CONFIG_TS["python"]["ts_language_object"] is None
+        assert ast_utils.LANG_CONFIG_TS["javascript"]["ts_language_object"] is None
+
+        root = ast_utils.parse_code_to_ast(b"def f(): pass", "python")
+
+        assert root is not None
+        assert ast_utils.LANG_CONFIG_TS["python"]["ts_language_object"] is not None
+        assert ast_utils.LANG_CONFIG_TS["javascript"]["ts_language_object"] is None
+
+    def test_background_preload_binds_requested_languages(self, monkeypatch):
+        """Preloading should bind grammars and compile queries without a parse."""
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        ast_utils.load_language_configs_for_llmfiles()
+
+        thread = ast_utils.preload_languages_in_background(["javascript", "cobol"])
+        assert thread is not None
+        thread.join(timeout=10)
+
+        assert ast_utils.LANG_CONFIG_TS["javascript"]["ts_language_object"] is not None
+        assert "javascript" in ast_utils.QUERIES_COMPILED_TS
+        assert ast_utils.LANG_CONFIG_TS["python"]["ts_language_object"] is None
+
+    def test_background_preload_ignores_unknown_languages(self):
+        assert ast_utils.preload_languages_in_background(["cobol"]) is None
+
+    def test_get_lang_obj_binds_on_first_use(self, monkeypatch):
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        ast_utils.load_language_configs_for_llmfiles()
+
+        lang_obj = ast_utils.get_lang_obj("javascript")
+
+        assert lang_obj is not None
+        assert ast_utils.LANG_CONFIG_TS["javascript"]["ts_language_object"] is lang_obj
+        assert ast_utils.get_lang_obj("javascript") is lang_obj
+        assert ast_utils.get_lang_obj("cobol") is None
+
+    def test_failed_grammar_load_is_attempted_once(self, monkeypatch):
+        """A grammar that fails to load is not retried, and later lookups skip the lock."""
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        monkeypatch.setattr(ast_utils, "_thread_local", threading.local())
+        ast_utils.load_language_configs_for_llmfiles()
+        loads, prepares = [], []
+        real_prepare = ast_utils._prepare_language
+
+        def failing_provider(lang_name):
+            loads.append(lang_name)
+            raise RuntimeError("grammar missing")
+
+        def counting_prepare(lang_name):
+            prepares.append(lang_name)
+            return real_prepare(lang_name)
+
+        monkeypatch.setattr(ast_utils, "_get_language_from_provider", failing_provider)
+        monkeypatch.setattr(ast_utils, "_prepare_language", counting_prepare)
+
+        for _ in range(3):
+            assert ast_utils.get_lang_obj("python") is None
+            assert ast_utils.parse_code_to_ast(b"x = 1", "python") is None
+
+        assert loads == ["python"]
+        assert prepares == ["python"]
+        assert ast_utils.LANG_CONFIG_TS["python"]["load_failed"] is True
+
+    def test_unknown_language_returns_none(self):
+        """Parsing an unregistered language should not raise."""
+        assert ast_utils.parse_code_to_ast(b"x", "cobol") is None
+
+    def test_repeated_calls_reuse_loaded_config(self):
+        """Calling the loader again should not rebuild the config."""
+        before = ast_utils.LANG_CONFIG_TS["python"]
+        ast_utils.load_language_configs_for_llmfiles()
+        assert ast_utils.LANG_CONFIG_TS["python"] is before
+
+
+class TestParserPerThread:
+    """Tests that each thread gets its own tree-sitter parser."""
+
+    def test_same_thread_reuses_parser(self):
+        """Repeated lookups on one thread should return the same parser."""
+        first = ast_utils._ensure_parser_initialized("python")
+        assert first is not None
+        assert ast_utils._ensure_parser_initialized("python") is first
+
+    def test_threads_get_distinct_parsers(self):
+        """Parsers must not be shared across threads."""
+        main_parser = ast_utils._ensure_parser_initialized("python")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            worker_parser = pool.submit(ast_utils._ensure_parser_initialized, "python").result()
+        assert worker_parser is not None
+        assert worker_parser is not main_parser
+
+    def test_concurrent_parsing(self):
+        """Parsing from many threads at once should give correct trees."""
+        sources = [f"def f{i}():\n    return {i}\n".encode() for i in range(32)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            roots = list(pool.map(lambda src: ast_utils.parse_code_to_ast(src, "python"), sources))
+        assert all(root is not None and root.type == "module" for root in roots)
+        assert all(not root.has_error for root in roots)
+
+    def test_concurrent_first_use_waits_for_queries(self, monkeypatch):
+        """A thread must not see a bound grammar whose queries are still compiling."""
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        monkeypatch.setattr(ast_utils, "_thread_local", threading.local())
+        ast_utils.load_language_configs_for_llmfiles()
+        real_query = ast_utils.Query
+
+        def slow_query(*args):
+            time.sleep(0.05)
+            return real_query(*args)
+
+        monkeypatch.setattr(ast_utils, "Query", slow_query)
+        src = b"def f():\n    return 1\n\nclass C:\n    pass\n"
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(
+                lambda _: python_parser.extract_python_elements(Path("m.py"), Path("."), src), range(16)
+            ))
+        assert [len(elements) for elements in results] == [2] * 16
+
+
+class TestTreeCache:
+    """Tests for reuse of parse trees within a run."""
+
+    @pytest.fixture(autouse=True)
+    def retain_trees(self):
+        ast_utils.clear_retained_trees()
+        ast_utils.set_tree_retention(True)
+        yield
+        ast_utils.set_tree_retention(False)
+        ast_utils.clear_retained_trees()
+
+    @pytest.fixture
+    def parse_calls(self, monkeypatch):
+        calls = []
+        real_parse = ast_utils._parse_uncached
+
+        def counting_parse(content_bytes, language_name):
+            calls.append(language_name)
+            return real_parse(content_bytes, language_name)
+
+        monkeypatch.setattr(ast_utils, "_parse_uncached", counting_parse)
+        return calls
+
+    def test_same_source_is_parsed_once(self, parse_calls):
+        """Parsing identical bytes twice should reuse the kept tree."""
+        src = b"import os\n\ndef cached():\n    return os.sep\n"
+        first = ast_utils.parse_code_to_ast(src, "python")
+        second = ast_utils.parse_code_to_ast(bytes(bytearray(src)), "python")
+        assert first == second
+        assert parse_calls == ["python"]
+
+    def test_tree_is_dropped_after_reuse(self, parse_calls):
+        """A kept tree is handed back once; nothing stays behind afterwards."""
+        src = b"def reused(): pass\n"
+        ast_utils.set_tree_retention(True)
+        ast_utils.parse_code_to_ast(src, "python")
+        ast_utils.set_tree_retention(False)
+        ast_utils.parse_code_to_ast(src, "python")
+        assert ast_utils._retained_trees == {}
+        ast_utils.parse_code_to_ast(src, "python")
+        assert parse_calls == ["python", "python"]
+
+    def test_trees_not_retained_by_default(self):
+        ast_utils.set_tree_retention(False)
+        ast_utils.parse_code_to_ast(b"def not_retained(): pass", "python")
+        assert ast_utils._retained_trees == {}
+
+    def test_cache_is_keyed_by_language(self):
+        """The same bytes parsed as another language must not reuse the tree."""
+        src = b"function f() { return 1; }"
+        js_root = ast_utils.parse_code_to_ast(src, "javascript")
+        py_root = ast_utils.parse_code_to_ast(src, "python")
+        assert js_root.type == "program"
+        assert py_root.type == "module"
+
+
+class TestSexpPrefix:
+    """Tests for sexp_prefix()."""
+
+    def test_matches_full_sexp_when_budget_allows(self):
+        """With a large budget the output should equal tree-sitter's own rendering."""
+        root = ast_utils.parse_code_to_ast(
+            b"class A:\n    def m(self, x):\n        return x + 1\n", "python"
+        )
+        assert ast_utils.sexp_prefix(root, 10_000) == str(root)
+
+    def test_matches_full_sexp_for_javascript(self):
+        root = ast_utils.parse_code_to_ast(b"const f = (a) => { return a * 2; };", "javascript")
+        assert ast_utils.sexp_prefix(root, 10_000) == str(root)
+
+    def test_truncates_to_budget(self):
+        """Output should be the first max_chars characters of the full rendering."""
+        src = b"".join(f"def f{i}():\n    return {i}\n".encode() for i in range(200))
+        root = ast_utils.parse_code_to_ast(src, "python")
+        excerpt = ast_utils.sexp_prefix(root, 200)
+        assert len(excerpt) == 200
+        assert str(root).startswith(excerpt)
+
+
+class TestCombinedQueries:
+    """Tests for the single compiled query per language."""
+
+    SOURCE = b"import os\n\ndef f():\n    pass\n\nclass C:\n    pass\n"
+
+    def test_one_query_per_language(self):
+        """All configured queries for a language compile into one Query."""
+        ast_utils.parse_code_to_ast(self.SOURCE, "python")
+        query_obj, capture_keys = ast_utils.QUERIES_COMPILED_TS["python"]
+        assert isinstance(query_obj, ast_utils.Query)
+        assert set(capture_keys.values()) == set(ast_utils.LANGUAGE_SPECS["python"]["queries"])
+
+    def test_run_queries_splits_captures_by_key(self):
+        """Each requested key gets only the captures from its own query."""
+        root = ast_utils.parse_code_to_ast(self.SOURCE, "python")
+        results = ast_utils.run_queries(["functions", "classes", "imports"], "python", root)
+        assert {name for _, name in results["functions"]} <= {"function.definition", "function.name"}
+        assert {name for _, name in results["classes"]} <= {"class.definition", "class.name"}
+        assert [name for _, name in results["imports"]] == ["import"]
+
+    def test_run_query_matches_run_queries(self):
+        root = ast_utils.parse_code_to_ast(self.SOURCE, "python")
+        assert ast_utils.run_query("classes", "python", root) == ast_utils.run_queries(["classes"], "python", root)["classes"]
+
+    def test_invalid_query_does_not_disable_the_others(self, monkeypatch):
+        """Queries that compile still run when another query of the language does not."""
+        monkeypatch.setattr(ast_utils, "LANG_CONFIG_TS", {})
+        monkeypatch.setattr(ast_utils, "QUERIES_COMPILED_TS", {})
+        monkeypatch.setattr(ast_utils, "_thread_local", threading.local())
+        ast_utils.load_language_configs_for_llmfiles()
+        queries = dict(ast_utils.LANG_CONFIG_TS["python"]["queries"])
+        queries["broken"] = "(no_such_node) @broken"
+        ast_utils.LANG_CONFIG_TS["python"]["queries"] = queries
+
+        root = ast_utils.parse_code_to_ast(self.SOURCE, "python")
+        results = ast_utils.run_queries(["functions", "classes", "broken"], "python", root)
+
+        assert results["functions"] and results["classes"]
+        assert results["broken"] == []
+        _, capture_keys = ast_utils.QUERIES_COMPILED_TS["python"]
+        assert "broken" not in capture_keys
+
+
+class TestGetNodeText:
+    """Tests for get_node_text()."""
+
+    def test_multibyte_text_is_decoded(self):
+        """Byte offsets from tree-sitter should decode to the right characters."""
+        src = "s = 'héllo wörld'\ndef naïve(): pass\n".encode()
+        root = ast_utils.parse_code_to_ast(src, "python")
+        func = root.named_children[1]
+        name_node = ast_utils.find_child_by_field(func, "name")
+        assert ast_utils.get_node_text(name_node, src) == "naïve"
+        assert ast_utils.get_node_text(root.named_children[0], src) == "s = 'héllo wörld'"
+
+    def test_missing_node_gives_empty_string(self):
+        assert ast_utils.get_node_text(None, b"abc") == ""
+
+
+class TestPythonDocstring:
+    """Tests for get_python_docstring()."""
+
+    def _body(self, src: bytes):
+        root = ast_utils.parse_code_to_ast(src, "python")
+        return ast_utils.find_child_by_field(root.named_child(0), "body")
+
+    def test_reads_docstring_from_first_statement(self):
+        src = b'def f():\n    """Does things."""\n    return 1\n'
+        assert ast_utils.get_python_docstring(self._body(src), src) == "Does things."
+
+    def test_no_docstring(self):
+        src = b"def f():\n    return 1\n"
+        assert ast_utils.get_python_docstring(self._body(src), src) is None
+
+
+class TestNodeKindIds:
+    """Tests for kind-id based node type checks."""
+
+    def test_kind_ids_resolved_on_bind(self):
+        ast_utils.parse_code_to_ast(b"x = 1", "python")
+        kind_ids = ast_utils.LANG_CONFIG_TS["python"]["kind_ids"]
+        assert set(kind_ids) == set(ast_utils.LANGUAGE_SPECS["python"]["node_types"])
+        assert all(isinstance(kind_id, int) and kind_id > 0 for kind_id in kind_ids.values())
+
+    def test_is_node_type_matches_type_name(self):
+        """is_node_type should agree with comparing node.type by name."""
+        src = b'def f():\n    """doc"""\n    return 1\n\nclass C:\n    pass\n'
+        root = ast_utils.parse_code_to_ast(src, "python")
+        node_types = ast_utils.LANGUAGE_SPECS["python"]["node_types"]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for type_key, type_name in node_types.items():
+                assert ast_utils.is_node_type(node, "python", type_key) == (node.type == type_name)
+            stack.extend(node.children)
+
+    def test_unknown_type_key_is_false(self):
+        root = ast_utils.parse_code_to_ast(b"x = 1", "python")
+        assert not ast_utils.is_node_type(root, "python", "no_such_key")
+        assert not ast_utils.is_node_type(None, "python", "block")
@@ -2,7 +2,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch
 from click.testing import CliRunner
-from llmfiles.cli.interface import main_cli_group
+from llmfiles.cli.interface import main_cli_group, _parse_file_size
 from llmfiles.structured_processing import ast_utils
 
 ast_utils.load_language_configs_for_llmfiles()
@@ -83,3 +83,26 @@ def test_cli_end_to_end_grep_seed():
         assert "source file: unrelated.py" not in output
         assert "external dependencies:" in output
         assert "- numpy" in output
+
+
+@pytest.mark.parametrize("size_str, expected", [
+    ("100", 100),
+    ("500KB", 500 * 1024),
+    ("1mb", 1024 ** 2),
+    ("1.5M", int(1.5 * 1024 ** 2)),
+    ("2 GB", 2 * 1024 ** 3),
+])
+def test_parse_file_size_units(size_str, expected):
+    assert _parse_file_size(size_str) == expected
+
+@pytest.mark.parametrize("size_str", ["", "MB", "10XB", "-1KB"])
+def test_parse_file_size_invalid_format(size_str):
+    with pytest.raises(ValueError):
+        _parse_file_size(size_str)
+
+
+def test_read_threads_must_be_positive(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(main_cli_group, [str(tmp_path), "--read-threads", "0"])
+    assert result.exit_code != 0
+    assert "--read-threads" in result.output
@@ -1,7 +1,9 @@
 import pytest
 from pathlib import Path
 from llmfiles.config.settings import PromptConfig
-from llmfiles.core.discovery.walker import grep_files_for_content
+from llmfiles.core.discovery import walker
+from llmfiles.core.discovery.pattern_matching import literal_include_dir_prefixes
+from llmfiles.core.discovery.walker import discover_paths, grep_files_for_content
 
 @pytest.fixture
 def grep_project(tmp_path: Path):
@@ -57,3 +59,122 @@ def test_grep_files_no_matches(grep_project: Path):
     found_files = list(grep_files_for_content(config))
 
     assert len(found_files) == 0
+
+
+@pytest.fixture
+def gitignore_project(tmp_path: Path):
+    """A project whose .gitignore excludes whole directories."""
+    proj_dir = tmp_path / "ignore_proj"
+    proj_dir.mkdir()
+    (proj_dir / ".gitignore").write_text("build/\nnode_modules\n")
+    (proj_dir / "main.py").write_text("print('main')\n")
+    for ignored in ("build", "node_modules", "src/build"):
+        (proj_dir / ignored).mkdir(parents=True)
+        (proj_dir / ignored / "generated.py").write_text("x = 1\n")
+    (proj_dir / "src" / "app.py").write_text("print('app')\n")
+    return proj_dir
+
+@pytest.fixture
+def listed_dirs(monkeypatch):
+    """Records every directory os.walk lists during discovery."""
+    listed = []
+    real_walk = walker.os.walk
+
+    def recording_walk(*args, **kwargs):
+        for root, dirs, files in real_walk(*args, **kwargs):
+            listed.append(Path(root))
+            yield root, dirs, files
+
+    monkeypatch.setattr(walker.os, "walk", recording_walk)
+    return listed
+
+def test_gitignored_directories_are_not_walked(gitignore_project: Path, listed_dirs):
+    config = PromptConfig(input_paths=[gitignore_project], base_dir=gitignore_project)
+
+    found = {p.relative_to(gitignore_project).as_posix() for p in walker.discover_paths(config)}
+
+    assert found == {"main.py", "src/app.py"}
+    assert sorted(d.relative_to(gitignore_project).as_posix() for d in listed_dirs) == [".", "src"]
+
+def test_negated_gitignore_pattern_still_reincludes(tmp_path: Path):
+    (tmp_path / ".gitignore").write_text("docs/*\n!docs/keep.md\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "keep.md").write_text("keep\n")
+    (tmp_path / "docs" / "drop.md").write_text("drop\n")
+    config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path)
+
+    found = {p.relative_to(tmp_path).as_posix() for p in discover_paths(config)}
+
+    assert found == {"docs/keep.md"}
+
+def test_no_ignore_walks_gitignored_directories(gitignore_project: Path):
+    config = PromptConfig(input_paths=[gitignore_project], base_dir=gitignore_project, no_ignore=True)
+
+    found = {p.relative_to(gitignore_project).as_posix() for p in discover_paths(config)}
+
+    assert "build/generated.py" in found
+    assert "src/build/generated.py" in found
+
+def test_hidden_files_and_directories(tmp_path: Path):
+    (tmp_path / ".env").write_text("SECRET=1\n")
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / ".cache" / "data.py").write_text("x = 1\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / ".hidden.py").write_text("x = 1\n")
+    (tmp_path / "pkg" / "visible.py").write_text("x = 1\n")
+
+    def found(**kwargs):
+        config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path, **kwargs)
+        return {p.relative_to(tmp_path).as_posix() for p in discover_paths(config)}
+
+    assert found() == {"pkg/visible.py"}
+    assert found(hidden=True) == {".env", ".cache/data.py", "pkg/.hidden.py", "pkg/visible.py"}
+
+def test_hidden_seed_directory_is_skipped(tmp_path: Path):
+    (tmp_path / ".config" / "nested").mkdir(parents=True)
+    (tmp_path / ".config" / "nested" / "settings.py").write_text("x = 1\n")
+    config = PromptConfig(input_paths=[tmp_path / ".config"], base_dir=tmp_path)
+
+    assert list(discover_paths(config)) == []
+
+def test_git_since_filters_walked_files(tmp_path: Path, monkeypatch):
+    (tmp_path / "changed.py").write_text("x = 1\n")
+    (tmp_path / "stale.py").write_text("x = 1\n")
+    config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path, git_since="1 week ago")
+
+    def found(git_result):
+        monkeypatch.setattr(walker, "get_git_modified_files", lambda since, base_dir: git_result)
+        return {p.relative_to(tmp_path).as_posix() for p in walker.discover_paths(config)}
+
+    assert found({tmp_path / "changed.py"}) == {"changed.py"}
+    assert found(set()) == set()
+    # a failed git lookup falls back to the unfiltered walk.
+    assert found(None) == {"changed.py", "stale.py"}
+
+def test_literal_include_directory_limits_the_walk(tmp_path: Path, listed_dirs):
+    for rel in ("src/pkg/mod.py", "src/main.py", "docs/guide.md", "vendor/src/lib.py", "README.md"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x\n")
+
+    config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path, include_patterns=["src/"])
+
+    found = {p.relative_to(tmp_path).as_posix() for p in walker.discover_paths(config)}
+
+    assert found == {"src/main.py", "src/pkg/mod.py"}
+    assert sorted(d.relative_to(tmp_path).as_posix() for d in listed_dirs) == [".", "src", "src/pkg"]
+
+def test_unanchored_include_still_matches_at_any_depth(tmp_path: Path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "notes.md").write_text("x\n")
+    (tmp_path / "notes.md").write_text("x\n")
+    config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path, include_patterns=["notes.md"])
+
+    found = {p.relative_to(tmp_path).as_posix() for p in discover_paths(config)}
+
+    assert found == {"notes.md", "a/b/notes.md"}
+
+def test_literal_include_dir_prefixes():
+    assert literal_include_dir_prefixes(["src/**", "docs/api/*.md"]) == ("src", "docs/api")
+    assert literal_include_dir_prefixes(["src/**", "*.py"]) is None
+    assert literal_include_dir_prefixes(["**/*.py"]) is None
+    assert literal_include_dir_prefixes(["src*/x.py"]) is None
@@ -1 +1,61 @@
 # llmfiles/tests/test_git_utils.py
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from llmfiles.core.discovery import git_utils
+from llmfiles.core.discovery.git_utils import get_git_modified_files, is_git_repository
+
+
+def _git(repo: Path, *args: str):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    """A git repository with a single commit touching two files."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
+    (repo / "a.py").write_text("a = 1\n")
+    (repo / "b.py").write_text("b = 2\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "initial")
+    return repo
+
+
+class TestGetGitModifiedFiles:
+    def test_returns_files_touched_since_date(self, git_repo):
+        modified = get_git_modified_files("1 day ago", git_repo)
+        assert modified == {(git_repo / "a.py").resolve(), (git_repo / "b.py").resolve()}
+
+    def test_single_subprocess_on_success(self, git_repo, monkeypatch):
+        """A successful lookup should not spawn a separate repository check."""
+        calls = []
+        real_run = subprocess.run
+
+        def counting_run(cmd, *args, **kwargs):
+            calls.append(cmd)
+            return real_run(cmd, *args, **kwargs)
+
+        monkeypatch.setattr(git_utils.subprocess, "run", counting_run)
+        get_git_modified_files("1 day ago", git_repo)
+        assert len(calls) == 1
+        assert calls[0][:2] == ["git", "log"]
+
+    def test_not_a_repository_returns_none(self, tmp_path):
+        assert get_git_modified_files("1 day ago", tmp_path) is None
+
+    def test_deleted_files_are_skipped(self, git_repo):
+        (git_repo / "b.py").unlink()
+        modified = get_git_modified_files("1 day ago", git_repo)
+        assert modified == {(git_repo / "a.py").resolve()}
+
+
+class TestIsGitRepository:
+    def test_detects_repository(self, git_repo, tmp_path):
+        assert is_git_repository(git_repo)
+        assert not is_git_repository(tmp_path)
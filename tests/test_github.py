@@ -6,7 +6,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import subprocess
 
-from llmfiles.core.github import is_github_url, normalize_github_url, clone_github_repo
+from llmfiles.core.github import is_github_url, normalize_github_url, clone_github_repo, clone_github_repos
 from llmfiles.exceptions import GitError
 
 
@@ -109,3 +109,38 @@ class TestCloneGithubRepo:
 
         call_args = mock_run.call_args[0][0]
         assert "https://github.com/user/repo" in call_args
+
+
+class TestCloneGithubRepos:
+    """Tests for cloning several repositories concurrently."""
+
+    @patch("llmfiles.core.github.subprocess.run")
+    def test_results_follow_input_order(self, mock_run, tmp_path):
+        """Cloned paths should line up with the input URLs."""
+        mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+        urls = [f"https://github.com/user/repo{i}" for i in range(6)]
+        target_dirs = [tmp_path / f"t{i}" for i in range(6)]
+
+        result = clone_github_repos(urls, target_dirs)
+
+        assert result == [d / "repo" for d in target_dirs]
+        assert mock_run.call_count == 6
+        cloned_urls = {call.args[0][3] for call in mock_run.call_args_list}
+        assert cloned_urls == set(urls)
+
+    @patch("llmfiles.core.github.subprocess.run")
+    def test_any_failure_raises_git_error(self, mock_run, tmp_path):
+        """A failed clone among several should raise GitError."""
+        def run(cmd, **kwargs):
+            failed = cmd[3].endswith("missing")
+            return MagicMock(returncode=int(failed), stderr="fatal: repository not found" if failed else "", stdout="")
+        mock_run.side_effect = run
+
+        with pytest.raises(GitError):
+            clone_github_repos(
+                ["https://github.com/user/ok", "https://github.com/user/missing"],
+                [tmp_path / "a", tmp_path / "b"],
+            )
+
+    def test_no_urls(self):
+        assert clone_github_repos([], []) == []
@@ -1 +1,72 @@
 # llmfiles/tests/test_output.py
+import io
+import sys
+
+import pytest
+
+from llmfiles.core import output
+from llmfiles.core.output import write_to_file, write_to_stdout
+
+
+@pytest.fixture
+def fake_stdout(monkeypatch):
+    """Replaces sys.stdout with a text wrapper over an inspectable byte buffer."""
+    def make(encoding="utf-8"):
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding=encoding, newline="")
+        monkeypatch.setattr(sys, "stdout", stream)
+        return raw
+    return make
+
+
+class TestWriteToStdout:
+    def test_small_output_written_as_text(self, fake_stdout):
+        raw = fake_stdout()
+        write_to_stdout("hello wörld\n")
+        assert raw.getvalue() == "hello wörld\n".encode("utf-8")
+
+    def test_large_output_written_as_bytes(self, fake_stdout, monkeypatch):
+        raw = fake_stdout()
+        written = []
+        monkeypatch.setattr(sys.stdout, "write", written.append, raising=False)
+        content = "x" * output.STDOUT_BYTES_FAST_PATH_MIN_CHARS + "é\n"
+        write_to_stdout(content)
+        assert written == []
+        assert raw.getvalue() == content.encode("utf-8")
+
+    def test_large_output_keeps_earlier_text_in_order(self, fake_stdout):
+        raw = fake_stdout()
+        sys.stdout.write("header\n")
+        content = "y" * output.STDOUT_BYTES_FAST_PATH_MIN_CHARS
+        write_to_stdout(content)
+        assert raw.getvalue() == ("header\n" + content).encode("utf-8")
+
+    def test_non_utf8_stdout_uses_text_layer(self, fake_stdout):
+        raw = fake_stdout(encoding="utf-16")
+        content = "z" * output.STDOUT_BYTES_FAST_PATH_MIN_CHARS
+        write_to_stdout(content)
+        assert raw.getvalue().decode("utf-16") == content
+
+    def test_newline_translating_platform_uses_text_layer(self, fake_stdout, monkeypatch):
+        fake_stdout()
+        written = []
+        monkeypatch.setattr(output.os, "linesep", "\r\n")
+        monkeypatch.setattr(sys.stdout, "write", written.append, raising=False)
+        content = "w" * output.STDOUT_BYTES_FAST_PATH_MIN_CHARS + "\n"
+        write_to_stdout(content)
+        assert written == [content]
+
+    @pytest.mark.parametrize("size", [16, output.STDOUT_BYTES_FAST_PATH_MIN_CHARS])
+    def test_lone_surrogate_handled_the_same_at_any_size(self, fake_stdout, size):
+        """Both paths encode strictly, so unencodable text takes the same fallback."""
+        raw = fake_stdout()
+        write_to_stdout("a" * size + "\ud800\n")
+        # the fallback's warning may be logged to the same stream first.
+        assert raw.getvalue().endswith(b"a" * size + b"?\n")
+        assert b"\xed\xa0\x80" not in raw.getvalue()
+
+class TestWriteToFile:
+    def test_writes_utf8(self, tmp_path):
+        target = tmp_path / "out.md"
+        write_to_file(target, "naïve\n")
+        assert target.read_bytes() == "naïve\n".encode("utf-8")
@@ -0,0 +1,264 @@
+# tests/test_pipeline.py
+"""Tests for the PromptGenerator pipeline."""
+
+from pathlib import Path
+
+import pytest
+
+from llmfiles.config.settings import PromptConfig, ChunkStrategy
+from llmfiles.core import pipeline
+from llmfiles.core.pipeline import PromptGenerator
+from llmfiles.structured_processing import ast_utils
+
+ast_utils.load_language_configs_for_llmfiles()
+
+
+@pytest.fixture
+def many_files_project(tmp_path: Path) -> Path:
+    """A project with more files than the parallel processing threshold."""
+    for i in range(pipeline.PARALLEL_PROCESSING_MIN_FILES * 3):
+        (tmp_path / f"mod_{i:02d}.py").write_text(f'"""Module {i}."""\n\ndef f_{i}():\n    return {i}\n')
+    return tmp_path
+
+
+class TestParallelProcessing:
+    """Tests that threaded file processing matches serial processing."""
+
+    def _generate(self, project: Path, chunk_strategy: ChunkStrategy) -> PromptGenerator:
+        config = PromptConfig(input_paths=[project], base_dir=project, chunk_strategy=chunk_strategy)
+        generator = PromptGenerator(config)
+        generator.generate()
+        return generator
+
+    @pytest.mark.parametrize("chunk_strategy", [ChunkStrategy.FILE, ChunkStrategy.STRUCTURE])
+    def test_parallel_matches_serial(self, many_files_project, monkeypatch, chunk_strategy):
+        file_count = len(list(many_files_project.glob("*.py")))
+        parallel = self._generate(many_files_project, chunk_strategy)
+        monkeypatch.setattr(pipeline, "PARALLEL_PROCESSING_MIN_FILES", 10**9)
+        serial = self._generate(many_files_project, chunk_strategy)
+
+        assert len(parallel.content_elements) == file_count
+        assert parallel.content_elements == serial.content_elements
+
+    def test_single_read_thread_is_serial(self, many_files_project, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("no thread pool expected with read_threads=1")
+
+        monkeypatch.setattr(pipeline, "ThreadPoolExecutor", fail)
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project, read_threads=1)
+        generator = PromptGenerator(config)
+        generator.generate()
+        assert len(generator.content_elements) == len(list(many_files_project.glob("*.py")))
+
+    def test_small_window_keeps_order(self, many_files_project, monkeypatch):
+        monkeypatch.setattr(pipeline, "PROCESSING_WINDOW_PER_WORKER", 1)
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project, read_threads=2)
+        generator = PromptGenerator(config)
+        paths = sorted(many_files_project.glob("*.py"))
+
+        processed = [path for path, _ in generator._process_files(paths)]
+
+        assert processed == paths
+
+    def test_results_follow_input_order(self, many_files_project):
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project)
+        generator = PromptGenerator(config)
+        paths = sorted(many_files_project.glob("*.py"), reverse=True)
+
+        processed = [path for path, _ in generator._process_files(paths)]
+
+        assert processed == paths
+
+    def test_discovery_is_streamed_into_processing(self, many_files_project, monkeypatch):
+        """Without dependency tracing, files are processed while discovery is still walking."""
+        events = []
+        real_discover = pipeline.discover_paths
+        real_process = pipeline.process_file_content_to_elements
+
+        def recording_discover(config):
+            for path in real_discover(config):
+                events.append(("discovered", path.name))
+                yield path
+
+        def recording_process(path, config):
+            events.append(("processed", path.name))
+            return real_process(path, config)
+
+        monkeypatch.setattr(pipeline, "discover_paths", recording_discover)
+        monkeypatch.setattr(pipeline, "process_file_content_to_elements", recording_process)
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project, read_threads=1)
+        PromptGenerator(config).generate()
+
+        first_processed = events.index(next(e for e in events if e[0] == "processed"))
+        last_discovered = max(i for i, e in enumerate(events) if e[0] == "discovered")
+        assert first_processed < last_discovered
+
+
+class TestTreeReuse:
+    """Tests that --recursive with structure chunking parses each file once."""
+
+    def test_each_file_parsed_once_beyond_old_cache_size(self, tmp_path, monkeypatch):
+        file_count = 200
+        for i in range(file_count):
+            (tmp_path / f"mod_{i:03d}.py").write_text(f"import os\n\ndef f_{i}():\n    return os.sep\n")
+        parses = []
+        real_parse = ast_utils._parse_uncached
+
+        def counting_parse(content_bytes, language_name):
+            parses.append(language_name)
+            return real_parse(content_bytes, language_name)
+
+        monkeypatch.setattr(ast_utils, "_parse_uncached", counting_parse)
+        config = PromptConfig(
+            input_paths=[tmp_path], base_dir=tmp_path, recursive=True, chunk_strategy=ChunkStrategy.STRUCTURE
+        )
+        generator = PromptGenerator(config)
+        generator.generate()
+
+        assert len(generator.content_elements) == file_count
+        assert len(parses) == file_count
+        assert ast_utils._retained_trees == {}
+
+    def test_retention_is_reset_when_resolution_raises(self, tmp_path, monkeypatch):
+        (tmp_path / "a.py").write_text("import os\n")
+
+        def failing_resolve(self, seed_files):
+            ast_utils.parse_code_to_ast(b"x = 1\n", "python")
+            raise RuntimeError("resolution failed")
+
+        monkeypatch.setattr(PromptGenerator, "_resolve_dependencies", failing_resolve)
+        config = PromptConfig(
+            input_paths=[tmp_path], base_dir=tmp_path, recursive=True, chunk_strategy=ChunkStrategy.STRUCTURE
+        )
+        with pytest.raises(RuntimeError):
+            PromptGenerator(config).generate()
+
+        assert ast_utils._retain_trees is False
+        assert ast_utils._retained_trees == {}
+
+
+class TestGrammarPreload:
+    """Tests that grammars are preloaded only for languages discovery actually finds."""
+
+    @pytest.fixture
+    def preloaded(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(ast_utils, "preload_languages_in_background", calls.append)
+        return calls
+
+    @pytest.fixture
+    def mixed_project(self, tmp_path: Path) -> Path:
+        for name in ("a.py", "b.py", "notes.txt", "c.js", "d.js"):
+            (tmp_path / name).write_text("x = 1\n")
+        return tmp_path
+
+    def test_structure_preloads_each_discovered_language_once(self, mixed_project, preloaded):
+        config = PromptConfig(
+            input_paths=[mixed_project], base_dir=mixed_project, chunk_strategy=ChunkStrategy.STRUCTURE
+        )
+        PromptGenerator(config).generate()
+
+        assert sorted(preloaded) == [["javascript"], ["python"]]
+
+    def test_no_preload_for_languages_not_in_the_tree(self, tmp_path, preloaded):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        config = PromptConfig(
+            input_paths=[tmp_path], base_dir=tmp_path, chunk_strategy=ChunkStrategy.STRUCTURE
+        )
+        PromptGenerator(config).generate()
+
+        assert preloaded == [["python"]]
+
+    def test_recursive_preloads_python_only(self, mixed_project, preloaded):
+        config = PromptConfig(input_paths=[mixed_project], base_dir=mixed_project, recursive=True)
+        PromptGenerator(config).generate()
+
+        assert preloaded == [["python"]]
+
+    def test_file_chunking_preloads_nothing(self, mixed_project, preloaded):
+        config = PromptConfig(input_paths=[mixed_project], base_dir=mixed_project)
+        PromptGenerator(config).generate()
+
+        assert preloaded == []
+
+
+class TestIncludedFilesSummary:
+    """Tests for the included-files list returned by generate()."""
+
+    def test_one_entry_per_file_sorted_by_path(self, tmp_path):
+        (tmp_path / "b.py").write_text("def one():\n    pass\n\ndef two():\n    pass\n")
+        (tmp_path / "a.py").write_text("x = 1\n")
+        config = PromptConfig(
+            input_paths=[tmp_path], base_dir=tmp_path, chunk_strategy=ChunkStrategy.STRUCTURE
+        )
+
+        _, included_files = PromptGenerator(config).generate()
+
+        assert included_files == [
+            {"path": "a.py", "size_bytes": (tmp_path / "a.py").stat().st_size},
+            {"path": "b.py", "size_bytes": (tmp_path / "b.py").stat().st_size},
+        ]
+
+
+class TestProgressDisplay:
+    """Tests for the progress bar selection in generate()."""
+
+    def test_no_rich_progress_when_stderr_is_not_a_tty(self, tmp_path, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("rich Progress should not be constructed")
+
+        monkeypatch.setattr("rich.progress.Progress", fail)
+        monkeypatch.setattr(pipeline.sys.stderr, "isatty", lambda: False, raising=False)
+        (tmp_path / "a.py").write_text("x = 1\n")
+        config = PromptConfig(input_paths=[tmp_path], base_dir=tmp_path)
+
+        output, included_files = PromptGenerator(config).generate()
+
+        assert "x = 1" in output
+        assert [f["path"] for f in included_files] == ["a.py"]
+
+
+class _RecordingProgress:
+    """Progress stand-in that records every update() call."""
+
+    def __init__(self):
+        self.updates = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_task(self, description, total=None):
+        return description
+
+    def update(self, task_id, **kwargs):
+        self.updates.append((task_id, kwargs))
+
+
+class TestProgressBatching:
+    """Tests that per-file progress is reported in batches."""
+
+    def test_processing_advance_is_batched_and_complete(self, many_files_project, monkeypatch):
+        recorder = _RecordingProgress()
+        monkeypatch.setattr(pipeline, "_NullProgress", lambda: recorder)
+        monkeypatch.setattr(pipeline, "PROGRESS_UPDATE_EVERY_N_FILES", 5)
+        monkeypatch.setattr(pipeline, "PROGRESS_UPDATE_INTERVAL_S", float("inf"))
+        file_count = len(list(many_files_project.glob("*.py")))
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project)
+
+        PromptGenerator(config).generate()
+
+        advances = [kw["advance"] for _, kw in recorder.updates if "advance" in kw]
+        assert sum(advances) == file_count
+        assert len(advances) == -(-file_count // 5)
+
+    def test_single_task_for_the_whole_run(self, many_files_project, monkeypatch):
+        recorder = _RecordingProgress()
+        monkeypatch.setattr(pipeline, "_NullProgress", lambda: recorder)
+        config = PromptConfig(input_paths=[many_files_project], base_dir=many_files_project, recursive=True)
+
+        PromptGenerator(config).generate()
+
+        assert {task for task, _ in recorder.updates} == {"discovering seed files..."}
@@ -69,8 +69,10 @@ class TestFileChunkStrategy:
 
         assert len(elements) == 1
         assert elements[0]["element_type"] == "file"
-        assert "class MyClass" in elements[0]["raw_content"]
-        assert "def standalone" in elements[0]["raw_content"]
+        assert "class MyClass" in elements[0]["llm_formatted_content"]
+        assert "def standalone" in elements[0]["llm_formatted_content"]
+        # the unformatted text is not kept alongside the formatted copy
+        assert "raw_content" not in elements[0]
 
 
 class TestStructureChunkStrategy:
@@ -0,0 +1,43 @@
+# tests/test_util.py
+from pathlib import Path
+
+import pytest
+
+from llmfiles.util import get_language_hint, relative_path_str
+
+
+class TestRelativePathStr:
+    """relative_path_str() should agree with Path.relative_to()."""
+
+    def test_matches_relative_to(self, tmp_path):
+        for path in (tmp_path / "a.py", tmp_path / "pkg" / "mod.py"):
+            assert relative_path_str(path, tmp_path) == str(path.relative_to(tmp_path))
+
+    def test_base_dir_itself(self, tmp_path):
+        assert relative_path_str(tmp_path, tmp_path) == "."
+
+    def test_outside_base_dir(self, tmp_path):
+        assert relative_path_str(tmp_path.parent / "other.py", tmp_path) is None
+
+    def test_sibling_with_shared_prefix(self, tmp_path):
+        """A sibling directory whose name starts with the base name is not inside it."""
+        base = tmp_path / "proj"
+        assert relative_path_str(tmp_path / "proj2" / "a.py", base) is None
+
+    def test_filesystem_root_base(self):
+        root = Path("/")
+        assert relative_path_str(Path("/etc/hosts"), root) == "etc/hosts"
+
+
+class TestGetLanguageHint:
+    @pytest.mark.parametrize("extension, expected", [
+        (".py", "python"),
+        ("py", "python"),
+        (".PY", "python"),
+        (".yml", "yaml"),
+        (".unknownext", "unknownext"),
+        ("", ""),
+        (None, ""),
+    ])
+    def test_hints(self, extension, expected):
+        assert get_language_hint(extension) == expected